@@ -1,10 +1,10 @@
 import os
 import json
-import shutil
 import logging
-import requests
 from abc import ABC, abstractmethod
 
+from src.scrapers.http_cache import CachedSession
+
 # Configuration des logs sans emojis
 logging.basicConfig(
     level=logging.INFO,
@@ -40,6 +40,9 @@ class BaseScraper(ABC):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept-Language": "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7"
         }
+        # Session partagee passant par le cache HTTP (requetes conditionnelles)
+        self.session = CachedSession()
+        self.session.headers.update(self.headers)
         logger.info(f"Scraper initialise. Dossier de sortie : {self.output_dir}")
 
     def save_html(self, filename, content):
@@ -77,7 +80,8 @@ class BaseScraper(ABC):
     def save_image(self, url, filename):
         """
         Telecharge une image depuis une URL et la sauvegarde dans le dossier images.
-        Gere le streaming pour eviter de charger de gros fichiers en memoire.
+        La requete passe par le cache HTTP : l'image est chargee entierement en memoire
+        (pas de streaming), ce qui convient aux photos iNaturalist (quelques centaines de Ko).
         """
         safe_name = self._sanitize_filename(filename)
         if not safe_name.lower().endswith(('.jpg', '.jpeg', '.png', '.webp')):
@@ -89,10 +93,10 @@ class BaseScraper(ABC):
             return False 
 
         try:
-            response = requests.get(url, headers=self.headers, stream=True, timeout=15)
+            response = self.session.get(url, timeout=15)
             response.raise_for_status()
             with open(path, 'wb') as out_file:
-                shutil.copyfileobj(response.raw, out_file)
+                out_file.write(response.content)
             return True
         except Exception as e:
             logger.error(f"Erreur telechargement Image {url} : {e}")
@@ -0,0 +1,280 @@
+import os
+import io
+import json
+import time
+import hashlib
+import threading
+import requests
+from urllib.parse import urlsplit
+from requests.structures import CaseInsensitiveDict
+
+# --- CONFIGURATION DU CACHE HTTP ---
+CACHE_DIR = os.path.join("data", "http_cache")
+MAX_CACHE_BYTES = 2 * 1024 ** 3  # 2 Go, les entrees les moins recemment utilisees sont evincees
+
+# Duree (secondes) pendant laquelle une reponse est servie sans contacter le serveur.
+# Au-dela, elle est revalidee (If-None-Match / If-Modified-Since).
+# Un domaine s'applique aussi a ses sous-domaines.
+FRESHNESS_BY_HOST = {
+    "api.inaturalist.org": 24 * 3600,
+    "www.inaturalist.org": 24 * 3600,
+    "static.inaturalist.org": 30 * 24 * 3600,                    # Photos : contenu immuable
+    "inaturalist-open-data.s3.amazonaws.com": 30 * 24 * 3600,
+    "wikipedia.org": 7 * 24 * 3600,
+}
+DEFAULT_FRESHNESS = 0  # Toujours revalider
+
+# Marqueurs de "Soft Ban" : iNaturalist renvoie parfois un 200 dont le corps est une page 429.
+# Ces reponses ne sont jamais mises en cache (sinon le retry de nettoyage.py serait inutile).
+SOFT_BAN_MARKERS_BY_HOST = {
+    "inaturalist.org": (b"Too Many Requests",),
+}
+
+# En-tetes conserves avec le corps de la reponse (stocke deja decompresse)
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+def host_policy(url, table, default):
+    """ Valeur de 'table' pour le domaine de l'URL (ou le domaine parent le plus proche) """
+    host = urlsplit(url).hostname or ""
+    parts = host.split(".")
+    for i in range(len(parts)):
+        candidate = ".".join(parts[i:])
+        if candidate in table:
+            return table[candidate]
+    return default
+
+
+def full_url(url, params=None):
+    """ URL complete telle qu'envoyee par requests (parametres inclus), base de la cle de cache """
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+class HttpCache:
+    """
+    Cache HTTP sur disque partage par toutes les sessions du projet.
+    Chaque entree = <cle>.json (URL, validateurs, en-tetes) + <cle>.bin (corps).
+    Thread-safe : un seul objet est partage entre les workers (voir get_http_cache).
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "errors": 0, "bytes_saved": 0, "evictions": 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Index memoire : cle -> [taille, dernier acces]
+        self.index = {}
+        for name in os.listdir(cache_dir):
+            if name.endswith(".bin"):
+                path = os.path.join(cache_dir, name)
+                self.index[name[:-4]] = [os.path.getsize(path), os.path.getmtime(path)]
+        self.total_bytes = sum(size for size, _ in self.index.values())
+
+    def key_for(self, url):
+        """ Cle de cache : empreinte de l'URL complete (parametres inclus) """
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def freshness_for(self, url):
+        """ Politique de fraicheur du domaine """
+        return host_policy(url, FRESHNESS_BY_HOST, DEFAULT_FRESHNESS)
+
+    def is_soft_ban(self, url, body):
+        """ Corps 200 qui est en realite une page d'erreur 429 """
+        markers = host_policy(url, SOFT_BAN_MARKERS_BY_HOST, ())
+        return any(marker in body for marker in markers)
+
+    def load(self, key):
+        """ Renvoie (meta, corps) ou None si l'entree est absente ou illisible """
+        meta_path = os.path.join(self.cache_dir, key + ".json")
+        body_path = os.path.join(self.cache_dir, key + ".bin")
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        with self.lock:
+            if key in self.index:
+                self.index[key][1] = time.time()
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return meta, body
+
+    def store(self, key, url, response, body):
+        """ Enregistre une reponse 200 (ecriture atomique) puis applique l'eviction """
+        headers = {h: response.headers[h] for h in STORED_HEADERS if h in response.headers}
+        meta = {"url": url, "stored_at": time.time(), "headers": headers}
+        self._write(key, meta, body)
+
+        with self.lock:
+            old_size = self.index.get(key, [0])[0]
+            self.index[key] = [len(body), time.time()]
+            self.total_bytes += len(body) - old_size
+            self._evict()
+
+    def touch(self, key, meta, response):
+        """ Reponse 304 : rafraichit la date de validation et les validateurs """
+        for h in ("ETag", "Last-Modified", "Cache-Control"):
+            if h in response.headers:
+                meta["headers"][h] = response.headers[h]
+        meta["stored_at"] = time.time()
+        self._write(key, meta)
+
+    def invalidate(self, url, params=None):
+        """ Supprime l'entree d'une URL (ex : page corrompue detectee apres coup) """
+        key = self.key_for(full_url(url, params))
+        with self.lock:
+            for ext in (".bin", ".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, key + ext))
+                except OSError:
+                    pass
+            if key in self.index:
+                self.total_bytes -= self.index.pop(key)[0]
+
+    def record(self, stat, saved_bytes=0):
+        with self.lock:
+            self.stats[stat] += 1
+            self.stats["bytes_saved"] += saved_bytes
+
+    def summary(self):
+        with self.lock:
+            s = dict(self.stats)
+        served = s["hits"] + s["revalidated"]
+        total = served + s["misses"]
+        ratio = (served / total * 100) if total else 0.0
+        return (f"Cache HTTP : {s['hits']} hits, {s['revalidated']} revalides (304), "
+                f"{s['misses']} miss ({ratio:.1f}% servis), {s['errors']} reponses en erreur, "
+                f"{s['bytes_saved'] / 1024 ** 2:.1f} Mo economises, {s['evictions']} evictions")
+
+    def _write(self, key, meta, body=None):
+        # Fichier temporaire propre au thread : deux workers peuvent ecrire la meme cle
+        suffix = f".{threading.get_ident()}.tmp"
+        if body is not None:
+            body_path = os.path.join(self.cache_dir, key + ".bin")
+            with open(body_path + suffix, "wb") as f:
+                f.write(body)
+            os.replace(body_path + suffix, body_path)
+
+        meta_path = os.path.join(self.cache_dir, key + ".json")
+        with open(meta_path + suffix, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(meta_path + suffix, meta_path)
+
+    def _evict(self):
+        """ Supprime les entrees les moins recemment utilisees (appele sous self.lock) """
+        if self.total_bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        for key, (size, _) in sorted(self.index.items(), key=lambda kv: kv[1][1]):
+            if self.total_bytes <= target:
+                break
+            for ext in (".bin", ".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, key + ext))
+                except OSError:
+                    pass
+            del self.index[key]
+            self.total_bytes -= size
+            self.stats["evictions"] += 1
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_http_cache():
+    """ Cache partage par toutes les sessions du processus """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
+
+
+class CachedSession(requests.Session):
+    """
+    Session requests qui passe les GET par le cache HTTP partage :
+    - reponse fraiche selon la politique du domaine -> servie sans requete
+    - sinon requete conditionnelle (If-None-Match / If-Modified-Since), corps servi depuis le cache sur 304
+    Les autres methodes ne sont pas mises en cache.
+    Chaque reponse porte un attribut 'cache_status' :
+    - "hit"         : servie depuis le cache, aucune requete reseau
+    - "revalidated" : 304 du serveur, corps servi depuis le cache (requete reseau effectuee)
+    - "miss"        : reponse du serveur (y compris erreurs 429/5xx et methodes hors GET)
+    Seul "hit" dispense l'appelant de sa temporisation.
+    Avec revalidate=True, chaque entree est revalidee aupres du serveur, meme si elle est fraiche.
+    """
+
+    def __init__(self, cache=None, revalidate=False):
+        super().__init__()
+        self.cache = cache or get_http_cache()
+        self.revalidate = revalidate
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        if method.upper() != "GET":
+            response = super().request(method, url, params=params, headers=headers, **kwargs)
+            response.cache_status = "miss"
+            return response
+
+        request_url = full_url(url, params)
+        key = self.cache.key_for(request_url)
+        cached = self.cache.load(key)
+
+        if cached:
+            meta, body = cached
+            age = time.time() - meta["stored_at"]
+            if not self.revalidate and age < self.cache.freshness_for(request_url):
+                self.cache.record("hits", len(body))
+                return self._from_cache(request_url, meta, body, "hit")
+
+            headers = dict(headers or {})
+            if "ETag" in meta["headers"]:
+                headers["If-None-Match"] = meta["headers"]["ETag"]
+            if "Last-Modified" in meta["headers"]:
+                headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+
+        # Le corps est toujours lu entierement pour pouvoir etre mis en cache
+        kwargs["stream"] = False
+        response = super().request(method, url, params=params, headers=headers, **kwargs)
+
+        if cached and response.status_code == 304:
+            self.cache.touch(key, meta, response)
+            self.cache.record("revalidated", len(body))
+            return self._from_cache(request_url, meta, body, "revalidated")
+
+        if response.status_code == 200:
+            self.cache.record("misses")
+            if self._is_storable(response, request_url):
+                self.cache.store(key, request_url, response, response.content)
+        else:
+            # 429, 5xx... : ni servies ni mises en cache, comptees a part des miss
+            self.cache.record("errors")
+        response.raw = io.BytesIO(response.content)
+        response.cache_status = "miss"
+        return response
+
+    def _is_storable(self, response, url):
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return False
+        if self.cache.is_soft_ban(url, response.content):
+            return False
+        has_validator = "ETag" in response.headers or "Last-Modified" in response.headers
+        return has_validator or self.cache.freshness_for(url) > 0
+
+    def _from_cache(self, url, meta, body, cache_status):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = body
+        response.raw = io.BytesIO(body)
+        response.cache_status = cache_status
+        return response
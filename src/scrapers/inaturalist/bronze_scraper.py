@@ -7,9 +7,12 @@ import concurrent.futures
 import threading
 from datetime import datetime
 
+from src.scrapers.http_cache import CachedSession, get_http_cache
+from src.scrapers.inaturalist.config import SCRAPING_PLAN, BRONZE_PAGES_DIR
+
 # --- CONFIGURATION STABILISÉE ---
-INPUT_PLAN = "data/0_planning/SCRAPING_PLAN_3.json"
-OUTPUT_DIR = "data/bronze/inaturalist/pages"
+INPUT_PLAN = SCRAPING_PLAN
+OUTPUT_DIR = BRONZE_PAGES_DIR
 
 # On réduit la charge pour éviter le "Soft Ban"
 MAX_WORKERS = 4 
@@ -30,7 +33,7 @@ thread_local = threading.local()
 def get_session():
     """ Crée une session avec un User-Agent aléatoire fixe pour ce thread """
     if not hasattr(thread_local, "session"):
-        thread_local.session = requests.Session()
+        thread_local.session = CachedSession()
         # On choisit une identité au hasard pour ce worker
         ua = random.choice(USER_AGENTS)
         thread_local.session.headers.update({
@@ -69,10 +72,14 @@ def get_full_wikipedia_content(session, scientific_name, common_name):
         except: continue
     return None
 
+def bronze_path(sp):
+    """ Chemin du fichier Bronze d'une espèce """
+    return os.path.join(OUTPUT_DIR, f"{sp['id']}.json")
+
 def process_species(sp):
     sp_id = sp['id']
     url = sp['url']
-    filename = os.path.join(OUTPUT_DIR, f"{sp_id}.json")
+    filename = bronze_path(sp)
     
     if os.path.exists(filename): return "EXISTS"
 
@@ -109,11 +116,16 @@ def process_species(sp):
                     "external_description": wiki_data
                 }
 
-                with open(filename, 'w', encoding='utf-8') as f:
+                # Écriture atomique : une interruption ne laisse jamais de fichier tronqué
+                tmp_filename = filename + ".tmp"
+                with open(tmp_filename, 'w', encoding='utf-8') as f:
                     json.dump(final_data, f, ensure_ascii=False)
+                os.replace(tmp_filename, filename)
 
                 # Pause aléatoire pour casser le rythme robotique
-                time.sleep(random.uniform(MIN_SLEEP, MAX_SLEEP))
+                # (inutile seulement si aucune requête n'a été envoyée : un 304 reste une requête)
+                if response.cache_status != "hit":
+                    time.sleep(random.uniform(MIN_SLEEP, MAX_SLEEP))
                 return "OK"
             
             elif response.status_code == 404:
@@ -162,6 +174,7 @@ def run_stable_scraper():
                 print(f"[{i+1}/{len(todo)}] Vit: {rate:.1f} sp/s | Erreurs: {stats['ERR']} ({err_rate:.1f}%) | Fin: ~{rem_min:.0f} min")
 
     print(f"Terminé. OK: {stats['OK']}, Erreurs: {stats['ERR']}")
+    print(get_http_cache().summary())
 
 if __name__ == "__main__":
     run_stable_scraper()
\ No newline at end of file
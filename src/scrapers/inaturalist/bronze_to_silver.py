@@ -3,9 +3,11 @@ import re
 import os
 from bs4 import BeautifulSoup
 
+from src.scrapers.inaturalist.config import BRONZE_DIR, SILVER_DIR
+
 # Configuration
-INPUT_FILE = "data/bronze/inaturalist/test_bronze_duck.json"
-OUTPUT_DIR = "data/silver/inaturalist"
+INPUT_FILE = os.path.join(BRONZE_DIR, "test_bronze_duck.json")
+OUTPUT_DIR = SILVER_DIR
 
 def extract_bg_image(style_str):
     """ Extrait l'URL propre depuis 'background-image: url(...)' """
@@ -18,15 +20,8 @@ def clean_text(text):
     if not text: return None
     return re.sub(r'\s+', ' ', text).strip()
 
-def process_deep_extraction():
-    print(f"🕵️  Démarrage de l'extraction APPROFONDIE sur : {INPUT_FILE}")
-    
-    if not os.path.exists(INPUT_FILE):
-        return
-
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        raw_data = json.load(f)
-
+def extract_silver_data(raw_data):
+    """ Transforme une page Bronze (HTML brut) en fiche Silver structurée """
     soup = BeautifulSoup(raw_data.get('raw_html_content', ''), 'html.parser')
     
     # --- 1. TAXONOMIE (Déjà validé) ---
@@ -128,14 +123,44 @@ def process_deep_extraction():
         },
         "source_url": raw_data['url']
     }
+    return silver_data
+
+def process_bronze_file(input_path):
+    """
+    Extrait la fiche Silver d'un fichier Bronze et la sauvegarde sous <id_source>.json.
+    Renvoie le chemin du fichier Silver.
+    """
+    with open(input_path, 'r', encoding='utf-8') as f:
+        raw_data = json.load(f)
+
+    silver_data = extract_silver_data(raw_data)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_path = os.path.join(OUTPUT_DIR, f"{silver_data['id_source']}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(silver_data, f, indent=4, ensure_ascii=False)
+    return output_path
+
+def process_deep_extraction():
+    print(f"🕵️  Démarrage de l'extraction APPROFONDIE sur : {INPUT_FILE}")
+    
+    if not os.path.exists(INPUT_FILE):
+        return
+
+    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+        raw_data = json.load(f)
+
+    silver_data = extract_silver_data(raw_data)
+    media = silver_data['media']
+    biogeo = silver_data['biogeographie']
 
     # --- SAUVEGARDE ET APERÇU ---
     print("\n--- APERÇU DES DONNÉES EXTRAITES ---")
     print(f"Taxonomie : {silver_data['taxonomie']}")
-    print(f"Photos récupérées : {len(photos)}")
-    print(f"Sons récupérés : {len(sounds)}")
-    print(f"Lignes de conservation : {len(conservation_status)}")
-    print(f"Lignes d'implantation : {len(establishment)}")
+    print(f"Photos récupérées : {len(media['photos'])}")
+    print(f"Sons récupérés : {len(media['sons'])}")
+    print(f"Lignes de conservation : {len(biogeo['conservation'])}")
+    print(f"Lignes d'implantation : {len(biogeo['implantation'])}")
     print(f"Début description : {silver_data['description_courte']}")
     
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -0,0 +1,19 @@
+import os
+
+# --- CHEMINS PARTAGES DU PIPELINE INATURALIST ---
+# Module volontairement sans dependance lourde : il est importe par
+# l'orchestrateur pour les commandes rapides (--help, status).
+
+# ID Taxonomique (3 = Aves/Oiseaux)
+TAXON_ID = 3
+
+PLANNING_DIR = os.path.join("data", "0_planning")
+SCRAPING_PLAN = os.path.join(PLANNING_DIR, f"SCRAPING_PLAN_{TAXON_ID}.json")
+
+BRONZE_DIR = os.path.join("data", "1_bronze", "inaturalist")
+BRONZE_PAGES_DIR = os.path.join(BRONZE_DIR, "pages")
+
+SILVER_DIR = os.path.join("data", "2_silver", "inaturalist")
+
+# Point de reprise de l'orchestrateur (ids deja traites par etape)
+PIPELINE_CHECKPOINT = os.path.join(PLANNING_DIR, f"PIPELINE_CHECKPOINT_{TAXON_ID}.json")
@@ -1,31 +1,29 @@
-import requests
 import json
 import time
 import os
 import sys
 
+from src.scrapers.http_cache import CachedSession, get_http_cache
+from src.scrapers.inaturalist.config import TAXON_ID, PLANNING_DIR, SCRAPING_PLAN
+
 # --- CONFIGURATION ---
 BASE_URL = "https://api.inaturalist.org/v1/taxa"
-OUTPUT_DIR = "data/0_planning"
+OUTPUT_DIR = PLANNING_DIR
 
-# ID Taxonomique (3 = Aves/Oiseaux)
-TAXON_ID = 3
 TIMEOUT_SEC = 30
 REQ_PER_SEC = 1.0  # Temporisation pour la stabilite
 
-def fetch_bird_species():
+def iter_bird_species(revalidate=False):
     """
-    Recupere la liste complete des especes via l'API.
+    Parcourt l'API page par page et renvoie les especes au fil de l'eau.
     Utilise la pagination 'id_above' pour garantir l'exhaustivite (10k+ especes).
     Ne garde que les donnees utiles pour le futur scraping.
+    Avec revalidate=True, les pages en cache sont revalidees aupres de l'API meme si elles sont fraiches.
     """
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    all_species = []
     last_id = 0
+    count = 0
     batch_size = 200 # Max par page
-    
-    print(f"Demarrage de l'indexation API (Taxon ID: {TAXON_ID})...")
+    session = CachedSession(revalidate=revalidate)
     
     while True:
         params = {
@@ -41,7 +39,7 @@ def fetch_bird_species():
         }
 
         try:
-            response = requests.get(BASE_URL, params=params, timeout=TIMEOUT_SEC)
+            response = session.get(BASE_URL, params=params, timeout=TIMEOUT_SEC)
             
             if response.status_code != 200:
                 print(f"Erreur API {response.status_code}")
@@ -64,32 +62,50 @@ def fetch_bird_species():
                     # Image API (utile comme backup si le scraping echoue)
                     'api_image_url': taxon.get('default_photo', {}).get('medium_url') if taxon.get('default_photo') else None
                 }
-                all_species.append(entry)
+                count += 1
+                yield entry
 
             last_id = results[-1]['id']
             
             # Feedback minimaliste
-            sys.stdout.write(f"\rIndexe : {len(all_species)} especes (Curseur ID: {last_id})")
+            sys.stdout.write(f"\rIndexe : {count} especes (Curseur ID: {last_id})")
             sys.stdout.flush()
 
-            time.sleep(REQ_PER_SEC)
+            # Un 304 (revalidation) reste une requete : seul un hit du cache evite la pause
+            if response.cache_status != "hit":
+                time.sleep(REQ_PER_SEC)
 
         except Exception as e:
             print(f"\nErreur : {e}")
             break
 
+def save_scraping_plan(all_species):
+    """
+    Ecrit le Plan de Scraping (JSON leger) lu par le scraper Bronze.
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    
+    with open(SCRAPING_PLAN, 'w', encoding='utf-8') as f:
+        json.dump(all_species, f, ensure_ascii=False, indent=4)
+
+    return SCRAPING_PLAN
+
+def fetch_bird_species():
+    """
+    Recupere la liste complete des especes via l'API et genere le plan de scraping.
+    """
+    print(f"Demarrage de l'indexation API (Taxon ID: {TAXON_ID})...")
+
+    all_species = list(iter_bird_species())
+
     # --- GENERATION DES FICHIERS ---
     print("\n" + "-" * 50)
     
-    # Fichier Plan de Scraping (JSON leger)
-    filename = f"SCRAPING_PLAN_{TAXON_ID}.json"
-    output_path = os.path.join(OUTPUT_DIR, filename)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(all_species, f, ensure_ascii=False, indent=4)
+    output_path = save_scraping_plan(all_species)
 
     print(f"Termine. {len(all_species)} especes indexees.")
     print(f"Fichier genere : {output_path}")
+    print(get_http_cache().summary())
 
 if __name__ == "__main__":
     fetch_bird_species()
\ No newline at end of file
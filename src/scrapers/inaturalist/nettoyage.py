@@ -2,8 +2,38 @@ import os
 import json
 import glob
 
+from src.scrapers.http_cache import get_http_cache
+from src.scrapers.inaturalist.config import BRONZE_PAGES_DIR
+
 # Dossier où sont stockés tes fichiers JSON bruts
-TARGET_DIR = "data/bronze/inaturalist/pages"
+TARGET_DIR = BRONZE_PAGES_DIR
+
+def is_corrupted(data):
+    """ Détecte les pages Bronze qui contiennent une réponse 429 au lieu du HTML """
+    html_content = data.get('raw_html_content', '')
+    # Les marqueurs d'erreur 429 dans le HTML partiel
+    return "Too Many Requests" in html_content or "429 Too Many Requests" in html_content
+
+def clean_file(filepath):
+    """
+    Vérifie un fichier Bronze et le supprime s'il est corrompu (page 429 ou JSON illisible).
+    L'entrée du cache HTTP est aussi supprimée pour que le prochain passage refasse la requête.
+    Renvoie True si le fichier est sain et peut passer en Silver.
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except ValueError:
+        # Fichier tronqué (ex : scraper interrompu pendant l'écriture)
+        os.remove(filepath)
+        return False
+
+    if is_corrupted(data):
+        os.remove(filepath)
+        if data.get('url'):
+            get_http_cache().invalidate(data['url'])
+        return False
+    return True
 
 def clean_corrupted_data():
     print(f"🧹 Démarrage du nettoyage dans : {TARGET_DIR}")
@@ -16,18 +46,8 @@ def clean_corrupted_data():
 
     for i, filepath in enumerate(files):
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            html_content = data.get('raw_html_content', '')
-            
-            # Les marqueurs d'erreur 429 dans le HTML partiel
-            if "Too Many Requests" in html_content or "429 Too Many Requests" in html_content:
-                print(f"❌ Fichier corrompu détecté (429) : {os.path.basename(filepath)}")
-                
-                # On ferme et on supprime
-                f.close() 
-                os.remove(filepath)
+            if not clean_file(filepath):
+                print(f"❌ Fichier corrompu détecté : {os.path.basename(filepath)}")
                 deleted_count += 1
                 
         except Exception as e:
@@ -0,0 +1,318 @@
+"""
+Orchestrateur du pipeline iNaturalist : Plan -> Bronze -> Nettoyage -> Silver.
+
+Les etapes tournent en parallele et s'echangent les especes via des files bornees :
+le parsing Silver demarre des que les premieres pages Bronze sont ecrites, et une
+file pleine ralentit automatiquement l'etape en amont (backpressure).
+Les especes terminees sont enregistrees dans un point de reprise, ce qui permet
+de relancer le pipeline apres une interruption sans refaire le travail.
+
+Usage (depuis la racine du projet) :
+    python src/scrapers/inaturalist/pipeline.py run --scrape-workers 4 --silver-workers 2
+    python src/scrapers/inaturalist/pipeline.py status
+"""
+import argparse
+import json
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+
+# Seule la configuration est importee ici : les modules lourds (requests, bs4)
+# sont charges au lancement de 'run' pour que --help et 'status' soient immediats.
+from src.scrapers.inaturalist.config import (
+    TAXON_ID, SCRAPING_PLAN, BRONZE_PAGES_DIR, SILVER_DIR, PIPELINE_CHECKPOINT
+)
+
+# --- CONFIGURATION ---
+QUEUE_SIZE = 50          # Taille max des files entre etapes
+CHECKPOINT_EVERY = 20    # Sauvegarde du point de reprise toutes les N especes
+REPORT_EVERY_SEC = 10    # Frequence de l'affichage de progression
+
+# Marqueur de fin de flux entre deux etapes
+STOP = object()
+
+
+class Checkpoint:
+    """
+    Point de reprise : ensemble des ids d'especes ayant traverse tout le pipeline.
+    Ecrit de facon atomique (fichier temporaire + os.replace).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.done = set()
+        self.pending = 0
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.done = set(json.load(f).get("done", []))
+
+    def is_done(self, sp_id):
+        return sp_id in self.done
+
+    def mark_done(self, sp_id):
+        with self.lock:
+            self.done.add(sp_id)
+            self.pending += 1
+            if self.pending >= CHECKPOINT_EVERY:
+                self._write()
+
+    def flush(self):
+        with self.lock:
+            self._write()
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "taxon_id": TAXON_ID,
+                "updated_at": datetime.now().isoformat(),
+                "done": sorted(self.done)
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.pending = 0
+
+
+class Stage:
+    """
+    Etape du pipeline : N workers lisent la file d'entree, appliquent 'func'
+    et poussent le resultat dans la file de sortie.
+    'func' renvoie None pour ecarter une espece (erreur, fichier corrompu...).
+    """
+
+    def __init__(self, name, func, workers, inbox, outbox=None):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.inbox = inbox
+        self.outbox = outbox
+        self.lock = threading.Lock()
+        self.alive = workers
+        self.stats = {"OK": 0, "ERR": 0}
+        self.threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def is_running(self):
+        return any(t.is_alive() for t in self.threads)
+
+    def _work(self):
+        while True:
+            item = self.inbox.get()
+            if item is STOP:
+                # On repasse le marqueur aux autres workers de la meme etape
+                self.inbox.put(STOP)
+                break
+
+            try:
+                result = self.func(item)
+            except Exception as e:
+                print(f"⚠️ [{self.name}] Erreur sur {item.get('id')} : {e}")
+                result = None
+
+            with self.lock:
+                self.stats["OK" if result is not None else "ERR"] += 1
+
+            if result is not None and self.outbox is not None:
+                # Bloquant si l'etape suivante est saturee (backpressure)
+                self.outbox.put(result)
+
+        with self.lock:
+            self.alive -= 1
+            last = self.alive == 0
+        if last and self.outbox is not None:
+            self.outbox.put(STOP)
+
+
+def iter_plan(refresh_plan):
+    """
+    Source du pipeline : relit le plan de scraping s'il existe,
+    sinon interroge l'API et diffuse les especes au fil de l'indexation.
+    Avec refresh_plan, les pages API du cache HTTP sont revalidees au lieu d'etre rejouees.
+    """
+    if os.path.exists(SCRAPING_PLAN) and not refresh_plan:
+        with open(SCRAPING_PLAN, 'r', encoding='utf-8') as f:
+            full_list = json.load(f)
+        # Mélange aléatoire pour ne pas taper toujours les mêmes familles
+        random.shuffle(full_list)
+        yield from full_list
+        return
+
+    from src.scrapers.inaturalist import main as planner
+
+    all_species = []
+    for sp in planner.iter_bird_species(revalidate=refresh_plan):
+        all_species.append(sp)
+        yield sp
+    print()
+    planner.save_scraping_plan(all_species)
+    print(f"Plan de scraping genere : {SCRAPING_PLAN} ({len(all_species)} especes)")
+
+
+def feed_plan(species, checkpoint, outbox, limit, errors):
+    """
+    Pousse les especes restantes dans la file du scraper, puis le marqueur de fin.
+    Une erreur de lecture du plan est transmise au thread principal via 'errors'.
+    """
+    sent = 0
+    try:
+        for sp in species:
+            # Au-dela de la limite on consomme quand meme la source :
+            # l'indexation API va jusqu'au bout et le plan complet est ecrit.
+            if limit and sent >= limit:
+                continue
+            if checkpoint.is_done(sp['id']):
+                continue
+            outbox.put(sp)
+            sent += 1
+    except Exception as e:
+        errors.append(e)
+    finally:
+        # Sans ce marqueur, les workers attendraient indefiniment
+        outbox.put(STOP)
+
+
+def run_pipeline(args):
+    # Chargement differe des etapes (requests, bs4)
+    from src.scrapers.http_cache import get_http_cache
+    from src.scrapers.inaturalist import bronze_scraper, nettoyage, bronze_to_silver
+
+    checkpoint = Checkpoint(PIPELINE_CHECKPOINT)
+    os.makedirs(BRONZE_PAGES_DIR, exist_ok=True)
+
+    def scrape(sp):
+        status = bronze_scraper.process_species(sp)
+        if status not in ("OK", "EXISTS"):
+            return None
+        return dict(sp, bronze_path=bronze_scraper.bronze_path(sp))
+
+    def clean(sp):
+        return sp if nettoyage.clean_file(sp['bronze_path']) else None
+
+    def to_silver(sp):
+        silver_path = bronze_to_silver.process_bronze_file(sp['bronze_path'])
+        checkpoint.mark_done(sp['id'])
+        return dict(sp, silver_path=silver_path)
+
+    scrape_q = queue.Queue(maxsize=args.queue_size)
+    clean_q = queue.Queue(maxsize=args.queue_size)
+    silver_q = queue.Queue(maxsize=args.queue_size)
+
+    scrape_workers = args.scrape_workers if args.scrape_workers is not None else bronze_scraper.MAX_WORKERS
+
+    stages = [
+        Stage("scrape", scrape, scrape_workers, scrape_q, clean_q),
+        Stage("clean", clean, args.clean_workers, clean_q, silver_q),
+        Stage("silver", to_silver, args.silver_workers, silver_q),
+    ]
+
+    print(f"🚀 Démarrage du pipeline ({len(checkpoint.done)} espèces déjà terminées)")
+    for stage in stages:
+        print(f"   - {stage.name} : {stage.workers} worker(s)")
+        stage.start()
+
+    plan_errors = []
+    feeder = threading.Thread(
+        target=feed_plan,
+        args=(iter_plan(args.refresh_plan), checkpoint, scrape_q, args.limit, plan_errors),
+        name="plan", daemon=True
+    )
+    feeder.start()
+
+    start = last_report = time.time()
+    try:
+        while feeder.is_alive() or any(stage.is_running() for stage in stages):
+            time.sleep(1)
+            if not args.quiet and time.time() - last_report >= REPORT_EVERY_SEC:
+                last_report = time.time()
+                elapsed = last_report - start
+                parts = [
+                    f"{s.name}: {s.stats['OK']} ok / {s.stats['ERR']} err (file {s.inbox.qsize()})"
+                    for s in stages
+                ]
+                print(f"[{elapsed:.0f}s] " + " | ".join(parts))
+    except KeyboardInterrupt:
+        print("\nInterruption : sauvegarde du point de reprise...")
+    finally:
+        checkpoint.flush()
+
+    done = stages[-1].stats["OK"]
+    errors = sum(s.stats["ERR"] for s in stages)
+    print(f"Terminé. Silver: {done}, Erreurs: {errors}, Total repris: {len(checkpoint.done)}")
+    print(get_http_cache().summary())
+
+    if plan_errors:
+        print(f"❌ Erreur lors de la lecture du plan de scraping : {plan_errors[0]}")
+        raise SystemExit(1)
+
+
+def show_status(args):
+    """ Etat du pipeline sans charger les modules de scraping """
+    def count_json(directory):
+        if not os.path.isdir(directory):
+            return 0
+        return sum(1 for name in os.listdir(directory) if name.endswith(".json"))
+
+    planned = None
+    if os.path.exists(SCRAPING_PLAN):
+        with open(SCRAPING_PLAN, 'r', encoding='utf-8') as f:
+            planned = len(json.load(f))
+
+    checkpoint = Checkpoint(PIPELINE_CHECKPOINT)
+
+    print(f"Plan de scraping : {SCRAPING_PLAN} ({planned if planned is not None else 'absent'})")
+    print(f"Pages Bronze     : {count_json(BRONZE_PAGES_DIR)}")
+    print(f"Fiches Silver    : {count_json(SILVER_DIR)}")
+    print(f"Point de reprise : {len(checkpoint.done)} espèces terminées")
+    if planned:
+        print(f"Reste            : {max(planned - len(checkpoint.done), 0)}")
+
+
+def positive_int(value):
+    """ Type argparse : entier >= 1 (0 worker bloquerait l'etape precedente) """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"doit etre >= 1 (recu : {value})")
+    return number
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Orchestrateur du pipeline iNaturalist (Plan -> Bronze -> Nettoyage -> Silver)."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Lance le pipeline complet (reprend au dernier point de reprise).")
+    run.add_argument("--scrape-workers", type=positive_int, default=None,
+                     help="Workers de scraping (defaut : MAX_WORKERS du scraper Bronze).")
+    run.add_argument("--clean-workers", type=positive_int, default=1, help="Workers de nettoyage.")
+    run.add_argument("--silver-workers", type=positive_int, default=2, help="Workers d'extraction Silver.")
+    run.add_argument("--queue-size", type=positive_int, default=QUEUE_SIZE,
+                     help="Taille max des files entre etapes (backpressure).")
+    run.add_argument("--limit", type=positive_int, default=None,
+                     help="Nombre max d'especes a traiter. Sans plan existant, l'indexation API "
+                          "va tout de meme jusqu'au bout pour ecrire le plan complet.")
+    run.add_argument("--refresh-plan", action="store_true",
+                     help="Reinterroge l'API meme si le plan de scraping existe deja "
+                          "(revalide aussi les pages API du cache HTTP).")
+    run.add_argument("--quiet", action="store_true", help="Desactive l'affichage de progression.")
+    run.set_defaults(func=run_pipeline)
+
+    status = sub.add_parser("status", help="Affiche l'avancement sans lancer de traitement.")
+    status.set_defaults(func=show_status)
+
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    args.func(args)
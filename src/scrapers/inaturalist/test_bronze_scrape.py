@@ -7,9 +7,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from src.scrapers.inaturalist.config import BRONZE_DIR
+
 # URL de test : Le Canard colvert (Anas platyrhynchos)
 TEST_URL = "https://www.inaturalist.org/taxa/6930-Anas-platyrhynchos"
-OUTPUT_DIR = "data/bronze/inaturalist"
+OUTPUT_DIR = BRONZE_DIR
 
 def get_driver():
     """ Configuration du driver """